@@ -0,0 +1,18 @@
+from django.core.cache import cache
+
+CATEGORY_CACHE_TIMEOUT = 60
+
+
+def category_cache_key(slug):
+    return f'category:{slug}'
+
+
+def get_cached_category(slug, fetch):
+    """Категория из кеша; при промахе вызывается fetch и результат
+    сохраняется на CATEGORY_CACHE_TIMEOUT секунд."""
+    return cache.get_or_set(category_cache_key(slug), fetch,
+                            CATEGORY_CACHE_TIMEOUT)
+
+
+def invalidate_category(slug):
+    cache.delete(category_cache_key(slug))
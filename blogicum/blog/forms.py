@@ -6,11 +6,8 @@ from .models import Comment, Post, User
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
-        fields = '__all__'
-        exclude = (
-            'author',
-            'created_at'
-        )
+        fields = ('title', 'text', 'pub_date', 'location', 'category',
+                  'image', 'is_published')
         widgets = {
             'pub_date': forms.DateTimeInput(attrs={
                 'type': 'datetime-local',
@@ -0,0 +1,18 @@
+from django.db import models
+from django.utils import timezone
+
+
+class PublishedManager(models.Manager):
+    def published(self, now=None):
+        """Опубликованные посты с подгруженными связями.
+
+        Момент времени вычисляется один раз на вызов, чтобы все
+        фильтры запроса использовали одно и то же значение.
+        """
+        if now is None:
+            now = timezone.now()
+        return self.select_related(
+            'author', 'location', 'category'
+        ).filter(is_published=True,
+                 category__is_published=True,
+                 pub_date__lte=now)
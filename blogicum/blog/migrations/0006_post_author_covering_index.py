@@ -0,0 +1,32 @@
+from django.db import migrations
+
+# Покрывающий индекс для проверки владения постом
+# (filter(pk=...) + author): PostgreSQL отвечает на неё
+# index-only сканом, не обращаясь к самой таблице.
+# Синтаксис INCLUDE есть только в PostgreSQL, поэтому на других
+# СУБД миграция ничего не делает.
+
+
+def create_covering_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS post_id_author '
+        'ON blog_post (id) INCLUDE (author_id)')
+
+
+def drop_covering_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS post_id_author')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_comment_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_covering_index, drop_covering_index),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from .managers import PublishedManager
+
 User = get_user_model()
 
 
@@ -66,8 +68,18 @@ class Post(PublishedModel):
                                  verbose_name='Категория',
                                  related_name='posts')
     image = models.ImageField('Фото', upload_to='posts_images', blank=True)
+    comment_count = models.PositiveIntegerField(
+        'Число комментариев', default=0, editable=False)
+
+    objects = PublishedManager()
 
     class Meta:
+        ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['-pub_date'], name='post_pubdate_desc'),
+            models.Index(fields=['is_published', 'category', '-pub_date']),
+            models.Index(fields=['author', '-pub_date']),
+        ]
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
@@ -83,6 +95,9 @@ class Comment(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE)
 
     class Meta:
-        ordering = ('created_at',)
+        ordering = ('post', 'created_at')
+        indexes = [
+            models.Index(fields=['post', 'created_at']),
+        ]
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
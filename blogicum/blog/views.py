@@ -1,14 +1,65 @@
+from functools import lru_cache
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.db.models import Count, Max
+from django.db.models.functions import Substr
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect
-from django.urls import reverse, reverse_lazy
-from django.utils import timezone
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
 from django.views.generic import (CreateView, DeleteView, DetailView,
                                   ListView, UpdateView)
+from .cache import get_cached_category
 from .forms import CommentForm, PostForm, ProfileForm
 from .models import Category, Comment, Post, User
 
 
+@lru_cache(maxsize=1024)
+def _cached_reverse(viewname, *kwarg_items):
+    return reverse(viewname, kwargs=dict(kwarg_items))
+
+
+def reverse_cached(viewname, **kwargs):
+    """reverse() с кешем готовых адресов.
+
+    Набор URL-шаблонов фиксирован на время работы процесса, поэтому
+    повторно обходить дерево резолвера для тех же аргументов незачем.
+    """
+    return _cached_reverse(viewname, *sorted(kwargs.items()))
+
+
+class AuthorRequiredMixin(LoginRequiredMixin):
+    """Доступ к изменению объекта только его автору.
+
+    Чужой объект не загружается целиком: наличие и владение проверяются
+    булевым exists-запросом, а get_queryset отдаёт только записи
+    текущего пользователя, так что несуществующий объект даёт 404.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.request.user)
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.user.is_authenticated
+                and self.model.objects
+                .filter(pk=kwargs[self.pk_url_kwarg])
+                .exclude(author=request.user).exists()):
+            return redirect('blog:post_detail', kwargs['pk'])
+        return super().dispatch(request, *args, **kwargs)
+
+
+def with_text_preview(queryset):
+    """Отложить загрузку полного текста, оставив короткий отрывок.
+
+    Карточкам в списках нужны только первые слова текста, а не весь
+    TextField целиком.
+    """
+    return queryset.annotate(
+        text_preview=Substr('text', 1, 200)).defer('text')
+
+
 class IndexList(ListView):
     model = Post
     template_name = 'blog/index.html'
@@ -16,13 +67,8 @@ class IndexList(ListView):
     ordering = ('-pub_date',)
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        queryset = queryset.annotate(comment_count=Count('comment'))
-        return queryset.select_related(
-            'author', 'location', 'category'
-        ).filter(is_published=True,
-                 category__is_published=True,
-                 pub_date__lte=timezone.now())
+        return with_text_preview(
+            Post.objects.published().order_by(*self.ordering))
 
 
 class PostCreate(LoginRequiredMixin, CreateView):
@@ -36,65 +82,72 @@ class PostCreate(LoginRequiredMixin, CreateView):
 
     def get_success_url(self):
         username = self.request.user.username
-        return reverse('blog:profile', kwargs={'username': username})
+        return reverse_cached('blog:profile', username=username)
+
+
+def post_detail_etag(request, pk, **kwargs):
+    """ETag страницы поста: меняется с новым/удалённым комментарием.
 
+    Один агрегирующий запрос по индексу заметно дешевле полного
+    рендеринга, а повторные посетители получают 304 Not Modified.
+    """
+    stamp = Post.objects.filter(pk=pk).annotate(
+        last_comment=Max('comment__created_at'),
+        n_comments=Count('comment'),
+    ).values_list('pub_date', 'last_comment', 'n_comments').first()
+    if stamp is None:
+        return None
+    pub_date, last_comment, n_comments = stamp
+    last = max(filter(None, (pub_date, last_comment)))
+    return f'{request.user.pk}-{n_comments}-{last.isoformat()}'
 
+
+@method_decorator(etag(post_detail_etag), name='dispatch')
 class PostDetail(DetailView):
     model = Post
     template_name = 'blog/detail.html'
 
+    def get_queryset(self):
+        return Post.objects.select_related(
+            'author', 'location', 'category'
+        ).using(settings.READ_DB_ALIAS)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comment.select_related('author')
+        # Словари вместо моделей: шаблону нужны лишь четыре поля,
+        # а на постах с сотнями комментариев экземпляры моделей
+        # заметно дороже по памяти.
+        context['comments'] = list(self.object.comment.values(
+            'id', 'text', 'created_at', 'author_id', 'author__username'))
         return context
 
 
-class PostUpdate(LoginRequiredMixin, UpdateView):
+class PostUpdate(AuthorRequiredMixin, UpdateView):
     model = Post
     form_class = PostForm
     template_name = 'blog/create.html'
-    slug_field = 'username'
-    slug_url_kwarg = 'username'
-    success_url = reverse_lazy('blog:profile')
-
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Post, pk=kwargs['pk'])
-        if instance.author != request.user:
-            return redirect('blog:post_detail', kwargs['pk'])
-        return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
         form.instance.author = self.request.user
         return super().form_valid(form)
 
     def get_success_url(self):
-        username = self.request.user
-        return reverse('blog:profile', kwargs={'username': username})
+        username = self.request.user.username
+        return reverse_cached('blog:profile', username=username)
 
 
-class PostDelete(LoginRequiredMixin, DeleteView):
+class PostDelete(AuthorRequiredMixin, DeleteView):
     model = Post
     template_name = 'blog/create.html'
 
-    def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(Post, pk=kwargs['pk'])
-        if instance.author != request.user:
-            return redirect('blog:post_detail', kwargs['pk'])
-        return super().dispatch(request, *args, **kwargs)
-
     def form_valid(self, form):
         form.instance.author = self.request.user
         return super().form_valid(form)
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['form'] = PostForm(instance=self.object)
-        return context
-
     def get_success_url(self):
-        username = self.request.user
-        return reverse('blog:profile', kwargs={'username': username})
+        username = self.request.user.username
+        return reverse_cached('blog:profile', username=username)
 
 
 class CategoryList(ListView):
@@ -104,22 +157,20 @@ class CategoryList(ListView):
 
     def get_queryset(self):
         category_slug = self.kwargs.get('category_slug')
-        category = get_object_or_404(
-            Category, slug=category_slug, is_published=True
-        )
-        return category.posts.select_related(
-            'author', 'location', 'category'
-        ).filter(is_published=True, pub_date__lte=timezone.now())
+        self.category = get_cached_category(
+            category_slug,
+            lambda: Category.objects.only(
+                'id', 'title', 'description', 'slug', 'is_published'
+            ).filter(slug=category_slug, is_published=True).first())
+        if self.category is None:
+            raise Http404(
+                f'Категория {category_slug} не найдена или снята '
+                'с публикации.')
+        return with_text_preview(self.category.posts.published())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        category = get_object_or_404(
-            Category.objects.values('id', 'title', 'description').filter(
-                is_published=True
-            ),
-            slug=self.kwargs['category_slug'],
-        )
-        context['category'] = category
+        context['category'] = self.category
         return context
 
 
@@ -138,8 +189,8 @@ class ProfileList(ListView):
             queryset = Post.objects.filter(author=self.author)
         else:
             queryset = super().get_queryset().filter(author=self.author)
-        queryset = queryset.annotate(comment_count=Count('comment'))
-        return queryset
+        queryset = queryset.select_related('author', 'location', 'category')
+        return with_text_preview(queryset)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -157,61 +208,49 @@ class ProfileUpdate(LoginRequiredMixin, UpdateView):
         return self.request.user
 
     def get_success_url(self):
-        username = self.request.user
-        return reverse('blog:profile', kwargs={'username': username})
+        username = self.request.user.username
+        return reverse_cached('blog:profile', username=username)
 
 
 class CommentAdd(LoginRequiredMixin, CreateView):
-    post_obj = None
     model = Comment
     form_class = CommentForm
     template_name = 'blog/comment.html'
 
     def dispatch(self, request, *args, **kwargs):
-        self.post_obj = get_object_or_404(Post, pk=kwargs['pk'])
+        if not Post.objects.filter(pk=kwargs['pk']).exists():
+            raise Http404(f'Пост {kwargs["pk"]} не найден.')
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = self.post_obj
+        form.instance.post_id = self.kwargs['pk']
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse('blog:post_detail', kwargs={'pk': self.post_obj.pk})
+        return reverse_cached('blog:post_detail', pk=self.kwargs['pk'])
 
 
-class CommentUpdate(LoginRequiredMixin, UpdateView):
+class CommentUpdate(AuthorRequiredMixin, UpdateView):
     model = Comment
     form_class = CommentForm
     pk_url_kwarg = "id"
     template_name = "blog/comment.html"
-    post_data = None
 
-    def dispatch(self, request, *args, **kwargs):
-        comment_pk = self.kwargs.get(self.pk_url_kwarg)
-        author = get_object_or_404(self.model, pk=comment_pk).author
-        if author != self.request.user:
-            return redirect("blog:post_detail", pk=self.kwargs["pk"])
-        self.post_data = get_object_or_404(Post, pk=kwargs["pk"])
-        return super().dispatch(request, args, **kwargs)
+    def get_queryset(self):
+        return super().get_queryset().select_related('post', 'author')
 
     def get_success_url(self):
-        pk = self.post_data.pk
-        return reverse("blog:post_detail", kwargs={"pk": pk})
+        return reverse_cached("blog:post_detail", pk=self.object.post_id)
 
 
-class CommentDelete(LoginRequiredMixin, DeleteView):
+class CommentDelete(AuthorRequiredMixin, DeleteView):
     model = Comment
     pk_url_kwarg = 'id'
     template_name = 'blog/comment.html'
 
-    def dispatch(self, request, *args, **kwargs):
-        comment_pk = self.kwargs.get(self.pk_url_kwarg)
-        author = get_object_or_404(self.model, pk=comment_pk).author
-        if author != self.request.user:
-            return redirect("blog:post_detail", pk=self.kwargs["pk"])
-        self.post_data = get_object_or_404(Post, pk=kwargs["pk"])
-        return super().dispatch(request, *args, **kwargs)
+    def get_queryset(self):
+        return super().get_queryset().select_related('post', 'author')
 
     def get_success_url(self):
-        return reverse('blog:post_detail', kwargs={'pk': self.object.post.pk})
+        return reverse_cached('blog:post_detail', pk=self.object.post_id)
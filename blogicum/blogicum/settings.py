@@ -75,6 +75,11 @@ DATABASES = {
     }
 }
 
+# Читающие запросы страницы поста можно увести с основной базы:
+# объявите реплику в DATABASES и укажите её алиас в переменной
+# окружения DJANGO_READ_DB_ALIAS.
+READ_DB_ALIAS = os.getenv('DJANGO_READ_DB_ALIAS', 'default')
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',